@@ -1,10 +1,15 @@
-from flask import Flask, render_template, request, jsonify, session
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, request, jsonify, session
+from flask_socketio import SocketIO, emit, join_room
 import logging
-import threading
 import os
+import sys
 import time
-from backend.instagram_bot import InstagramBot
+import uuid
+from backend.config import Config
+from backend.bot_manager import BotManager
+from backend.jobs import JobManager
+from backend.metrics import metrics
+from backend.progress import ProgressState
 
 # Configure logging
 logging.basicConfig(
@@ -15,34 +20,50 @@ logger = logging.getLogger('app')
 
 # Initialize Flask app
 app = Flask(__name__, 
-            static_folder='frontend/static', 
-            template_folder='frontend/templates')
+            static_folder='../frontend/static', 
+            template_folder='../frontend/templates')
 app.secret_key = os.urandom(24)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=Config.ASYNC_MODE)
 
-# Global bot instance
-bot_instance = None
-bot_lock = threading.Lock()
+start_time = time.time()
 
-# Progress tracking for mass DMs
-dm_progress = {
-    "running": False,
-    "current": 0,
-    "total": 0,
-    "successful": 0,
-    "failed": 0
-}
+def create_bot():
+    """Launch a new bot; Selenium and webdriver-manager are only imported here"""
+    from backend.instagram_bot import InstagramBot
+    return InstagramBot(headless=Config.HEADLESS)
+
+# Global bot, launched on first use and closed again when idle
+bot_manager = BotManager(create_bot, idle_timeout=Config.BOT_IDLE_TIMEOUT)
+reaper_started = False
+
+def job_complete(job):
+    """Notify the client that started a background job that it has finished"""
+    room = job.meta.get('room')
+    if room:
+        socketio.emit('job_update', job.to_dict(), to=room)
+
+# Background jobs for browser operations
+job_manager = JobManager(socketio, on_complete=job_complete)
+
+# Progress tracking for mass DMs, published to the owning client on a fixed tick
+dm_progress = ProgressState()
+publisher_started = False
+
+def client_room():
+    """Return the Socket.IO room of the browser session making this request"""
+    if 'client_id' not in session:
+        session['client_id'] = uuid.uuid4().hex
+    return session['client_id']
 
 @app.route('/')
 def index():
     """Render the main page"""
+    client_room()
     return render_template('index.html')
 
 @app.route('/api/login', methods=['POST'])
 def login():
     """Handle Instagram login"""
-    global bot_instance
-    
     data = request.json
     username = data.get('username')
     password = data.get('password')
@@ -50,46 +71,123 @@ def login():
     if not username or not password:
         return jsonify({"status": "error", "message": "Username and password are required"})
     
-    # Create a new bot instance if one doesn't exist
-    with bot_lock:
-        if bot_instance is None:
-            bot_instance = InstagramBot(headless=True)
+    # Run the login in the background and let the client poll for the result
+    job = job_manager.submit('login', run_login, username, password,
+                             meta={"username": username, "room": client_room()})
+    return jsonify({"status": "pending", "job_id": job.id})
+
+def run_login(username, password):
+    """Launch the bot if needed and log in (runs as a background job)"""
+    with bot_manager.use() as bot:
+        # A session restored from saved cookies doesn't need the login form again,
+        # but the credentials still have to match the ones it was created with
+        if bot.is_logged_in:
+            if bot.username == username and bot.check_password(password):
+                return {"status": "success", "generation": bot_manager.generation}
+            # The login page redirects a logged-in browser, so drop the other session first
+            bot.clear_session()
+        return dict(bot.login(username, password), generation=bot_manager.generation)
+
+@app.route('/api/logout', methods=['POST'])
+def logout():
+    """Forget this client's login; the shared browser stays logged in"""
+    for key in ('logged_in', 'username', 'bot_generation'):
+        session.pop(key, None)
+    return jsonify({"status": "success"})
+
+def prewarm_browser():
+    """Resolve the driver and launch the browser ahead of the first login"""
+    def run_prewarm():
+        start = time.time()
+        bot_manager.get()
+        logger.info(f"Browser pre-warmed in {time.time() - start:.2f}s")
     
-    # Attempt to log in
-    result = bot_instance.login(username, password)
+    # Queued like any other job so a login submitted meanwhile waits for it
+    return job_manager.submit('prewarm', run_prewarm)
+
+def start_idle_reaper():
+    """Start the background task that closes the browser once it has been idle"""
+    global reaper_started
     
-    if result["status"] == "success":
-        session['logged_in'] = True
-        session['username'] = username
-        return jsonify({"status": "success"})
-    elif result["status"] == "verification_required":
-        return jsonify({"status": "verification_required"})
-    else:
-        return jsonify({"status": "error", "message": result.get("message", "Login failed")})
+    if reaper_started or not Config.BOT_IDLE_TIMEOUT:
+        return
+    reaper_started = True
+    
+    def reaper():
+        while True:
+            socketio.sleep(Config.BOT_REAPER_INTERVAL)
+            if bot_manager.is_idle():
+                # Closing the driver blocks, so it runs as a job like any other browser call
+                job_manager.submit('idle_reap', bot_manager.reap_idle)
+    
+    socketio.start_background_task(reaper)
+
+def start_background_services():
+    """Start the idle reaper and, if configured, pre-warm the browser"""
+    if Config.PREWARM_BROWSER:
+        prewarm_browser()
+    start_idle_reaper()
+
+def shutdown():
+    """Close the browser (saving its session) before the process exits"""
+    logger.info("Shutting down, closing browser")
+    bot_manager.close()
 
 @app.route('/api/verify-complete', methods=['POST'])
 def verify_complete():
     """Handle completion of manual verification"""
-    global bot_instance
-    
-    if not bot_instance:
+    if bot_manager.peek() is None:
         return jsonify({"status": "error", "message": "No active session"})
     
+    job = job_manager.submit('verify', run_verify_check, meta={"room": client_room()})
+    return jsonify({"status": "pending", "job_id": job.id})
+
+def run_verify_check():
+    """Check whether manual verification has completed (runs as a background job)"""
     # Check if the user is now logged in
-    if bot_instance.check_login_status():
+    with bot_manager.use() as bot:
+        if bot.check_login_status():
+            return {"status": "success", "generation": bot_manager.generation}
+        else:
+            return {"status": "error", "message": "Verification not complete or failed"}
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Report the state of a background job"""
+    job = job_manager.get(job_id)
+    # Jobs are only visible to the browser session that started them
+    if job is None or job.meta.get('room') != client_room():
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    
+    # A successful login is only recorded in the session once the client collects it
+    if job.kind in ('login', 'verify') and job.status == "finished" and job.result.get("status") == "success":
         session['logged_in'] = True
-        return jsonify({"status": "success"})
-    else:
-        return jsonify({"status": "error", "message": "Verification not complete or failed"})
+        session['bot_generation'] = job.result.get('generation')
+        if job.meta.get('username'):
+            session['username'] = job.meta['username']
+    
+    return jsonify(job.to_dict())
 
 # Additional API endpoints for user extraction and DM sending
+def bot_login_valid():
+    """Whether this client's login still belongs to the running browser"""
+    if not session.get('logged_in'):
+        return False
+    # A browser relaunched (idle shutdown, crash) without a restorable session is logged out
+    if session.get('bot_generation') != bot_manager.generation:
+        session.pop('logged_in', None)
+        return False
+    return True
+
+def logged_out_response():
+    """Tell the client its login is gone and it has to log in again"""
+    return jsonify({"status": "error", "message": "Not logged in, please log in again", "logged_out": True})
+
 @app.route('/api/extract-users', methods=['POST'])
 def extract_users():
     """Extract followers or following from a target account"""
-    global bot_instance
-    
-    if not bot_instance or not session.get('logged_in'):
-        return jsonify({"status": "error", "message": "Not logged in"})
+    if not bot_login_valid():
+        return logged_out_response()
     
     data = request.json
     target_username = data.get('username')
@@ -99,25 +197,24 @@ def extract_users():
     if not target_username:
         return jsonify({"status": "error", "message": "Target username is required"})
     
-    # Extract the users
-    if extraction_type == 'followers':
-        result = bot_instance.get_user_followers(target_username, max_count=max_count)
-    else:
-        result = bot_instance.get_user_following(target_username, max_count=max_count)
-    
-    return jsonify(result)
+    # Extract the users in the background
+    job = job_manager.submit('extract', run_extract, target_username, extraction_type, max_count,
+                             meta={"room": client_room()})
+    return jsonify({"status": "pending", "job_id": job.id})
+
+def run_extract(target_username, extraction_type, max_count):
+    """Extract followers or following (runs as a background job)"""
+    with bot_manager.use() as bot:
+        if extraction_type == 'followers':
+            return bot.get_user_followers(target_username, max_count=max_count)
+        else:
+            return bot.get_user_following(target_username, max_count=max_count)
 
 @app.route('/api/send-mass-dm', methods=['POST'])
 def send_mass_dm():
     """Start the mass DM process"""
-    global bot_instance, dm_progress
-    
-    if not bot_instance or not session.get('logged_in'):
-        return jsonify({"status": "error", "message": "Not logged in"})
-    
-    # Check if a DM process is already running
-    if dm_progress["running"]:
-        return jsonify({"status": "error", "message": "A mass DM process is already running"})
+    if not bot_login_valid():
+        return logged_out_response()
     
     data = request.json
     usernames = data.get('usernames', [])
@@ -131,66 +228,99 @@ def send_mass_dm():
     if not message:
         return jsonify({"status": "error", "message": "Message cannot be empty"})
     
-    # Reset progress
-    dm_progress = {
-        "running": True,
-        "current": 0,
-        "total": len(usernames),
-        "successful": 0,
-        "failed": 0
-    }
-    
-    # Start the DM process in a separate thread
-    threading.Thread(
-        target=run_mass_dm, 
-        args=(usernames, message, (min_delay, max_delay))
-    ).start()
+    # Reset progress, unless a DM process is already running
+    room = client_room()
+    if not dm_progress.start(len(usernames), room):
+        return jsonify({"status": "error", "message": "A mass DM process is already running"})
+    
+    # Start the DM process as a background job
+    start_progress_publisher()
+    job_manager.submit('mass_dm', run_mass_dm, usernames, message, (min_delay, max_delay),
+                       meta={"room": room})
     
     return jsonify({"status": "started", "total": len(usernames)})
 
 def run_mass_dm(usernames, message, delay_range):
-    """Run the mass DM process in a background thread"""
-    global bot_instance, dm_progress
-    
+    """Run the mass DM process as a background job"""
     try:
-        def progress_callback(data):
-            global dm_progress
-            
-            if data["status"] == "success":
-                dm_progress["successful"] += 1
-            elif data["status"] == "failed":
-                dm_progress["failed"] += 1
-            
-            dm_progress["current"] = data["current"]
-            
-            # Emit progress via Socket.IO
-            socketio.emit('dm_progress_update', {
-                "current": data["current"],
-                "total": data["total"],
-                "successful": dm_progress["successful"],
-                "failed": dm_progress["failed"],
-                "username": data.get("username", ""),
-                "status": data["status"],
-                "reason": data.get("reason", ""),
-                "delay": data.get("delay", 0)
-            })
-        
-        # Run the mass DM
-        result = bot_instance.mass_dm(usernames, message, delay_range, progress_callback)
-        
-        # Update progress and emit completion
-        dm_progress["running"] = False
-        socketio.emit('dm_complete', result)
+        # Run the mass DM; progress is only recorded here and emitted by the publisher
+        with bot_manager.use() as bot:
+            result = bot.mass_dm(usernames, message, delay_range, dm_progress.update)
+        # mass_dm reports failures such as a relaunched, logged-out browser without raising
+        if result.get("status") == "complete":
+            dm_progress.finish(result=result)
+        else:
+            dm_progress.finish(error=result.get("message", "Mass DM failed"))
         
     except Exception as e:
         logger.error(f"Error in mass DM process: {str(e)}")
-        dm_progress["running"] = False
-        socketio.emit('dm_error', {"message": str(e)})
+        dm_progress.finish(error=str(e))
+
+def start_progress_publisher():
+    """Start the background task that emits coalesced mass DM progress"""
+    global publisher_started
+    
+    if publisher_started:
+        return
+    publisher_started = True
+    
+    def publisher():
+        while True:
+            socketio.sleep(Config.PROGRESS_EMIT_INTERVAL)
+            for room, state, events, outcome in dm_progress.drain():
+                if room is None:
+                    continue
+                socketio.emit('dm_progress_update', dict(state, events=events), to=room)
+                if outcome and outcome["error"]:
+                    socketio.emit('dm_error', {"message": outcome["error"]}, to=room)
+                elif outcome:
+                    socketio.emit('dm_complete', outcome["result"], to=room)
+    
+    socketio.start_background_task(publisher)
+
+@app.route('/healthz')
+def healthz():
+    """Report process and browser state without launching a browser"""
+    return jsonify({
+        "status": "ok",
+        "pid": os.getpid(),
+        "uptime": round(time.time() - start_time, 1),
+        "rss_bytes": process_rss(),
+        "browser_stack_loaded": 'selenium' in sys.modules,
+        "driver": bot_manager.state(),
+        "jobs": job_manager.counts()
+    })
+
+def process_rss():
+    """Resident memory of this process in bytes, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Expose bot timing spans and error counters in Prometheus text format"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @socketio.on('connect')
 def handle_connect():
     """Handle Socket.IO connection"""
     logger.info("Client connected")
+    room = session.get('client_id')
+    if not room:
+        return
+    join_room(room)
+    
+    # Late joiners (reloads, extra tabs) get the current state of their own run
+    owner, state = dm_progress.snapshot()
+    if owner == room:
+        emit('dm_progress_update', dict(state, events=[], snapshot=True))
 
 if __name__ == '__main__':
+    start_background_services()
     socketio.run(app, debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
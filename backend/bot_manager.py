@@ -0,0 +1,116 @@
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BotManager:
+    """Own the shared InstagramBot: lazy launch, health checks and idle shutdown
+
+    The browser is only started when something needs it, is relaunched if its
+    webdriver session has died, and is closed again after idle_timeout seconds
+    without use so its memory is returned between sessions.
+
+    generation increases whenever a (re)launched browser comes up logged out,
+    so callers can tell that a login made against an earlier browser is gone.
+    """
+
+    def __init__(self, factory, idle_timeout=900):
+        self.logger = logging.getLogger('bot_manager')
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self._bot = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._last_used = time.time()
+        self.generation = 0
+
+    @contextmanager
+    def use(self):
+        """Yield a healthy bot, launching or relaunching it as needed"""
+        with self._lock:
+            self._active += 1
+        try:
+            yield self.get()
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.time()
+
+    def get(self):
+        """Return a healthy bot, launching or relaunching it as needed"""
+        with self._lock:
+            self._last_used = time.time()
+            if self._bot is not None and not self.is_healthy(self._bot):
+                self.logger.warning("Webdriver session is dead, relaunching browser")
+                self._shutdown()
+            if self._bot is None:
+                start = time.time()
+                self._bot = self.factory()
+                self.logger.info(f"Browser launched in {time.time() - start:.2f}s")
+                if not self._bot.is_logged_in:
+                    self.generation += 1
+            return self._bot
+
+    def peek(self):
+        """Return the current bot without launching one"""
+        return self._bot
+
+    def state(self):
+        """Describe the browser's lifecycle state without touching the driver"""
+        bot = self._bot
+        if bot is None:
+            return {"state": "stopped"}
+        return {
+            "state": "running",
+            "in_use": self._active,
+            "idle": round(time.time() - self._last_used, 1),
+            "logged_in": bot.is_logged_in
+        }
+
+    @staticmethod
+    def is_healthy(bot):
+        """Check that the bot's webdriver session still answers"""
+        if bot.driver is None:
+            return False
+        try:
+            bot.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def is_idle(self):
+        """Whether a running browser has been unused for longer than idle_timeout"""
+        if not self.idle_timeout or self._bot is None or self._active:
+            return False
+        return time.time() - self._last_used > self.idle_timeout
+
+    def reap_idle(self):
+        """Close the browser if it is still idle"""
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if not self.is_idle():
+                return False
+            self.logger.info(f"Closing browser after {time.time() - self._last_used:.0f}s idle")
+            self._shutdown()
+            return True
+        finally:
+            self._lock.release()
+
+    def close(self):
+        """Close the browser unconditionally"""
+        with self._lock:
+            self._shutdown()
+
+    def _shutdown(self):
+        bot, self._bot = self._bot, None
+        if bot is None:
+            return
+        try:
+            bot.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing webdriver: {str(e)}")
+        del bot
+        gc.collect()
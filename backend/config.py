@@ -7,14 +7,54 @@ load_dotenv()
 class Config:
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY', os.urandom(24))
+    ASYNC_MODE = os.environ.get('ASYNC_MODE')  # 'eventlet' or 'threading', auto-detected if unset
     
     # Selenium settings
     HEADLESS = os.environ.get('HEADLESS', 'True').lower() == 'true'
+    PREWARM_BROWSER = os.environ.get('PREWARM_BROWSER', 'True').lower() == 'true'
+    BOT_IDLE_TIMEOUT = int(os.environ.get('BOT_IDLE_TIMEOUT', 900))  # seconds, 0 disables
+    BOT_REAPER_INTERVAL = 30  # seconds between idle checks
+    
+    # Waits: condition-driven, each bounded by these upper limits (seconds)
+    IMPLICIT_WAIT = 10
+    WAIT_POLL_INTERVAL = 0.1
+    PAGE_READY_TIMEOUT = int(os.environ.get('PAGE_READY_TIMEOUT', 10))
+    COOKIE_BANNER_TIMEOUT = int(os.environ.get('COOKIE_BANNER_TIMEOUT', 2))
+    LOGIN_RESULT_TIMEOUT = int(os.environ.get('LOGIN_RESULT_TIMEOUT', 15))
+    SCROLL_LOAD_TIMEOUT = int(os.environ.get('SCROLL_LOAD_TIMEOUT', 2))
+    
+    # Browser resource profile: 'lean' skips images, media and webfonts, 'full' loads everything
+    BROWSER_RESOURCE_PROFILE = os.environ.get('BROWSER_RESOURCE_PROFILE', 'lean').lower()
+    PAGE_LOAD_STRATEGY = os.environ.get('PAGE_LOAD_STRATEGY')  # defaults to 'eager' when lean, else 'normal'
+    LEAN_BLOCKED_URLS = [
+        "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.heic*",
+        "*.mp4*", "*.webm*", "*.m4a*", "*.m4v*",
+        "*.woff*", "*.ttf*", "*.otf*"
+    ]
+    
+    # Chromedriver resolution
+    CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH')  # use this binary, skip resolution
+    DRIVER_CACHE_FILE = os.environ.get(
+        'DRIVER_CACHE_FILE',
+        os.path.join(os.path.expanduser('~'), '.cache', 'instagram-bot', 'chromedriver.json')
+    )
+    DRIVER_CACHE_TTL = int(os.environ.get('DRIVER_CACHE_TTL', 7 * 24 * 3600))  # seconds
+    DRIVER_OFFLINE = os.environ.get('DRIVER_OFFLINE', 'False').lower() == 'true'
+    
+    # Session persistence across restarts ('' disables)
+    SESSION_COOKIE_FILE = os.environ.get(
+        'SESSION_COOKIE_FILE',
+        os.path.join(os.path.expanduser('~'), '.cache', 'instagram-bot', 'cookies.json')
+    )
     
     # Instagram settings
+    INSTAGRAM_BASE_URL = os.environ.get('INSTAGRAM_BASE_URL', 'https://www.instagram.com')
     DEFAULT_MIN_DELAY = 30  # seconds
     DEFAULT_MAX_DELAY = 60  # seconds
     MAX_EXTRACTION_COUNT = 1000
     
+    # Interval between coalesced mass DM progress updates (seconds)
+    PROGRESS_EMIT_INTERVAL = float(os.environ.get('PROGRESS_EMIT_INTERVAL', 1.0))
+    
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
@@ -1,23 +1,146 @@
+import os
+import json
 import time
 import random
 import logging
+import threading
+import functools
+import hashlib
+import hmac
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, SessionNotCreatedException
+from backend.config import Config
+from backend.metrics import metrics
+from backend import waits
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def resolve_chromedriver_path(refresh=False):
+    """Return the chromedriver binary path, resolving it at most once per cache TTL
+
+    The resolved path is memoized in-process and persisted to
+    Config.DRIVER_CACHE_FILE, so restarts skip webdriver-manager's version
+    lookup. In offline mode a cached path is used regardless of its age.
+    refresh=True drops both caches first, for when the cached driver no
+    longer matches the installed Chrome.
+    """
+    global _driver_path
+    logger = logging.getLogger('instagram_bot')
+    
+    if Config.CHROMEDRIVER_PATH:
+        return Config.CHROMEDRIVER_PATH
+    
+    with _driver_path_lock:
+        if refresh:
+            _driver_path = None
+            try:
+                os.remove(Config.DRIVER_CACHE_FILE)
+            except OSError:
+                pass
+        
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        
+        # Try the on-disk cache
+        cached = None
+        try:
+            with open(Config.DRIVER_CACHE_FILE) as f:
+                cached = json.load(f)
+            if not os.path.exists(cached.get("path", "")):
+                cached = None
+        except (OSError, ValueError):
+            cached = None
+        
+        if cached and (Config.DRIVER_OFFLINE or time.time() - cached.get("resolved_at", 0) < Config.DRIVER_CACHE_TTL):
+            _driver_path = cached["path"]
+            logger.info(f"Using cached chromedriver at {_driver_path}")
+            return _driver_path
+        
+        if Config.DRIVER_OFFLINE:
+            raise RuntimeError("No cached chromedriver available and DRIVER_OFFLINE is set")
+        
+        # Resolve (and possibly download) through webdriver-manager, imported only when needed
+        from webdriver_manager.chrome import ChromeDriverManager
+        start = time.time()
+        try:
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            if cached:
+                logger.warning(f"Chromedriver lookup failed ({str(e)}), using stale cached path")
+                _driver_path = cached["path"]
+                return _driver_path
+            raise
+        logger.info(f"Resolved chromedriver at {path} in {time.time() - start:.2f}s")
+        
+        try:
+            os.makedirs(os.path.dirname(Config.DRIVER_CACHE_FILE), exist_ok=True)
+            with open(Config.DRIVER_CACHE_FILE, 'w') as f:
+                json.dump({"path": path, "resolved_at": time.time()}, f)
+        except OSError as e:
+            logger.warning(f"Could not write chromedriver cache: {str(e)}")
+        
+        _driver_path = path
+        return _driver_path
+
+def instrumented(operation):
+    """Record an InstagramBot method's wall time and result status under the given operation name"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            previous, self._operation = self._operation, operation
+            status = "exception"
+            try:
+                with metrics.span('instagram_bot_operation_seconds', operation=operation):
+                    result = method(self, *args, **kwargs)
+                if isinstance(result, dict):
+                    status = result.get("status", "unknown")
+                elif isinstance(result, bool):
+                    status = "success" if result else "failure"
+                else:
+                    status = "success"
+                return result
+            finally:
+                metrics.inc('instagram_bot_operations_total', operation=operation, status=status)
+                self._operation = previous
+        return wrapper
+    return decorator
+
+PASSWORD_HASH_ITERATIONS = 200000
+
+# Links to user profiles inside the followers/following dialog
+USER_LINK_XPATH = ".//a[contains(@href, '/')]"
+
+# Resolves to which login state the current page shows, or null while it is still rendering
+LOGIN_STATE_SCRIPT = """
+if (document.querySelector("input[name='username']")) return "logged_out";
+if (document.querySelector("a[href*='/direct/inbox'], svg[aria-label='Home']")) return "logged_in";
+return null;
+"""
 
 class InstagramBot:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, resource_profile=None, cookie_file=None, base_url=None):
         self.logger = logging.getLogger('instagram_bot')
         self.driver = None
         self.headless = headless
+        self.base_url = (base_url or Config.INSTAGRAM_BASE_URL).rstrip('/')
+        self.resource_profile = resource_profile or Config.BROWSER_RESOURCE_PROFILE
+        self.cookie_file = Config.SESSION_COOKIE_FILE if cookie_file is None else cookie_file
         self.is_logged_in = False
+        self.username = None
+        self.password_hash = None  # salted hash of the password used for the live session
+        self.sleep_time = 0.0  # total seconds spent in fixed sleeps
+        self._operation = None  # label for metrics recorded by the phase helpers
         self.setup_driver()
+        if self.cookie_file and os.path.exists(self.cookie_file):
+            self.restore_session()
         
+    @instrumented('setup_driver')
     def setup_driver(self):
         """Initialize the Selenium webdriver"""
         chrome_options = Options()
@@ -32,72 +155,277 @@ class InstagramBot:
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
-        self.logger.info("Webdriver initialized")
+        # The bot only reads text and links, so the lean profile skips heavy resources
+        lean = self.resource_profile == 'lean'
+        if lean:
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2
+            })
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+            chrome_options.add_argument("--mute-audio")
+        chrome_options.page_load_strategy = Config.PAGE_LOAD_STRATEGY or ('eager' if lean else 'normal')
+        
+        start = time.time()
+        try:
+            self.driver = webdriver.Chrome(service=Service(resolve_chromedriver_path()), options=chrome_options)
+        except SessionNotCreatedException as e:
+            # Usually a cached driver left behind by a Chrome update; resolve a matching one once
+            if Config.CHROMEDRIVER_PATH or Config.DRIVER_OFFLINE:
+                raise
+            self.logger.warning(f"Chromedriver could not start a session ({e.msg}), resolving it again")
+            self.driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(refresh=True)), options=chrome_options)
+        self.driver.implicitly_wait(Config.IMPLICIT_WAIT)
+        if lean:
+            # Block media and webfonts at the network layer as well
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Config.LEAN_BLOCKED_URLS})
+        self.logger.info(f"Webdriver initialized in {time.time() - start:.2f}s ({self.resource_profile} profile)")
         
+    @contextmanager
+    def _phase(self, phase):
+        """Time one phase of the current operation and count webdriver failures in it"""
+        operation = self._operation or "other"
+        try:
+            with metrics.span('instagram_bot_phase_seconds', operation=operation, phase=phase):
+                yield
+        except TimeoutException:
+            # Probes wait for something that is often legitimately absent, so
+            # their timeouts are not failures
+            if phase != 'probe':
+                metrics.inc('instagram_bot_timeouts_total', operation=operation, phase=phase)
+            raise
+        except NoSuchElementException:
+            raise
+        except WebDriverException:
+            metrics.inc('instagram_bot_driver_errors_total', operation=operation, phase=phase)
+            raise
+    
+    def _navigate(self, url):
+        with self._phase('navigation'):
+            self.driver.get(url)
+    
+    def _wait(self, timeout, condition, phase='wait'):
+        # Goes through wait_for_any so the implicit wait can't stretch a poll past timeout
+        return self._wait_any({phase: condition}, timeout, phase=phase)[1]
+    
+    def _find(self, by, value):
+        with self._phase('find'):
+            return self.driver.find_element(by, value)
+    
+    def _find_all(self, by, value, root=None):
+        with self._phase('find'):
+            return (root or self.driver).find_elements(by, value)
+    
+    def _click(self, element):
+        with self._phase('click'):
+            element.click()
+    
+    def _type(self, element, text, clear=False):
+        with self._phase('input'):
+            if clear:
+                element.clear()
+            element.send_keys(text)
+    
+    def _script(self, script, *args):
+        with self._phase('script'):
+            return self.driver.execute_script(script, *args)
+    
+    def _wait_any(self, conditions, timeout, phase='wait'):
+        with self._phase(phase):
+            return waits.wait_for_any(self.driver, conditions, timeout,
+                                      poll_frequency=Config.WAIT_POLL_INTERVAL,
+                                      implicit_wait=Config.IMPLICIT_WAIT)
+    
+    def _sleep(self, seconds, phase='sleep'):
+        """Fixed sleep, accounted separately from real waiting"""
+        self.sleep_time += seconds
+        with self._phase(phase):
+            time.sleep(seconds)
+    
+    @instrumented('login')
     def login(self, username, password):
         """Login to Instagram"""
         self.logger.info(f"Attempting to log in as {username}")
         try:
-            self.driver.get("https://www.instagram.com/accounts/login/")
-            time.sleep(3)  # Wait for the page to load
+            self._navigate(f"{self.base_url}/accounts/login/")
+            
+            # Wait for the form to render instead of sleeping a fixed time
+            username_field = self._wait(Config.PAGE_READY_TIMEOUT,
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='username']"))
+            )
             
             # Accept cookies if prompted
             try:
-                cookie_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Accept') or contains(text(), 'Allow')]"))
-                )
-                cookie_button.click()
-                time.sleep(2)
-            except:
+                _, cookie_button = self._wait_any({
+                    "banner": waits.element_clickable(By.XPATH, "//button[contains(text(), 'Accept') or contains(text(), 'Allow')]")
+                }, Config.COOKIE_BANNER_TIMEOUT, phase='probe')
+                self._click(cookie_button)
+                self._wait(Config.COOKIE_BANNER_TIMEOUT, EC.invisibility_of_element(cookie_button), phase='probe')
+            except TimeoutException:
                 self.logger.info("No cookie consent prompt found or already accepted")
             
             # Enter username
-            username_field = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='username']"))
-            )
-            username_field.clear()
-            username_field.send_keys(username)
+            self._type(username_field, username, clear=True)
             
             # Enter password
-            password_field = self.driver.find_element(By.CSS_SELECTOR, "input[name='password']")
-            password_field.clear()
-            password_field.send_keys(password)
+            password_field = self._find(By.CSS_SELECTOR, "input[name='password']")
+            self._type(password_field, password, clear=True)
             
             # Click login button
-            login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            login_button.click()
+            login_button = self._find(By.CSS_SELECTOR, "button[type='submit']")
+            self._click(login_button)
+            
+            # Resolve as soon as the page shows the outcome; the challenge check
+            # must come first since challenge URLs don't contain "login" either
+            try:
+                outcome, value = self._wait_any({
+                    "verification_required": waits.url_contains("suspicious_login", "challenge"),
+                    "success": waits.url_lacks("login"),
+                    "error": waits.element_present(By.ID, "slfErrorAlert")
+                }, Config.LOGIN_RESULT_TIMEOUT)
+            except TimeoutException:
+                self.logger.error("Login failed: Unknown error")
+                return {"status": "error", "message": "Unknown login error"}
             
-            # Check for security verification
-            time.sleep(5)
-            if "suspicious_login" in self.driver.current_url or "challenge" in self.driver.current_url:
+            if outcome == "verification_required":
                 self.logger.warning("Security verification required")
+                # Bind the credentials now so the session saved after verification carries them
+                self.username = username
+                self.password_hash = self._hash_password(password)
                 return {"status": "verification_required"}
             
-            # Check if login was successful
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    lambda driver: "login" not in driver.current_url
-                )
-                self.is_logged_in = True
-                self.logger.info("Successfully logged in")
-                return {"status": "success"}
-            except TimeoutException:
-                # Check for error messages
-                try:
-                    error_message = self.driver.find_element(By.ID, "slfErrorAlert").text
-                    self.logger.error(f"Login failed: {error_message}")
-                    return {"status": "error", "message": error_message}
-                except:
-                    self.logger.error("Login failed: Unknown error")
-                    return {"status": "error", "message": "Unknown login error"}
+            if outcome == "error":
+                error_message = value.text
+                self.logger.error(f"Login failed: {error_message}")
+                return {"status": "error", "message": error_message}
+            
+            self.is_logged_in = True
+            self.username = username
+            self.password_hash = self._hash_password(password)
+            self.logger.info("Successfully logged in")
+            self.save_session()
+            return {"status": "success"}
                 
         except Exception as e:
             self.logger.error(f"Exception during login: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @staticmethod
+    def _hash_password(password, salt=None):
+        """Return a salted PBKDF2 hash of the password as {"salt", "hash"} hex strings"""
+        salt = bytes.fromhex(salt) if salt else os.urandom(16)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PASSWORD_HASH_ITERATIONS)
+        return {"salt": salt.hex(), "hash": digest.hex()}
+    
+    def check_password(self, password):
+        """Check a password against the one the current session was logged in with"""
+        if not self.password_hash:
+            return False
+        candidate = self._hash_password(password, self.password_hash["salt"])
+        return hmac.compare_digest(candidate["hash"], self.password_hash["hash"])
+    
+    @instrumented('check_login_status')
+    def check_login_status(self):
+        """Check whether the browser holds a logged-in session"""
+        # No session cookie means no session; skip the page load entirely
+        if not self.driver.get_cookie("sessionid"):
+            self.is_logged_in = False
+            return False
+        
+        try:
+            self._navigate(f"{self.base_url}/")
+            if "challenge" in self.driver.current_url or "suspicious_login" in self.driver.current_url:
+                self.is_logged_in = False
+                return False
+            
+            try:
+                state = self._wait(Config.PAGE_READY_TIMEOUT,
+                    lambda driver: driver.execute_script(LOGIN_STATE_SCRIPT)
+                )
+                self.is_logged_in = state == "logged_in"
+            except TimeoutException:
+                self.is_logged_in = "login" not in self.driver.current_url
+        except Exception as e:
+            self.logger.error(f"Error checking login status: {str(e)}")
+            self.is_logged_in = False
+        
+        if self.is_logged_in:
+            self.save_session()
+        return self.is_logged_in
+    
+    def save_session(self):
+        """Persist the browser's cookies so a restarted bot can skip the login form"""
+        if not self.cookie_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cookie_file) or '.', exist_ok=True)
+            # Session cookies are credentials, keep the file private to this user
+            fd = os.open(self.cookie_file + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    "username": self.username,
+                    "password_hash": self.password_hash,
+                    "cookies": self.driver.get_cookies()
+                }, f)
+            os.replace(self.cookie_file + ".tmp", self.cookie_file)
+            self.logger.info("Session cookies saved")
+        except Exception as e:
+            self.logger.warning(f"Could not save session cookies: {str(e)}")
+    
+    @instrumented('restore_session')
+    def restore_session(self):
+        """Load saved cookies into the browser and check whether they are still valid"""
+        try:
+            with open(self.cookie_file) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read session cookies: {str(e)}")
+            return False
+        
+        try:
+            # Cookies can only be set for the current domain; robots.txt is the cheapest page on it
+            self._navigate(f"{self.base_url}/robots.txt")
+            now = time.time()
+            for cookie in saved.get("cookies", []):
+                if cookie.get("expiry") and cookie["expiry"] < now:
+                    continue
+                if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                    cookie.pop("sameSite", None)
+                self.driver.add_cookie(cookie)
+        except Exception as e:
+            self.logger.warning(f"Could not restore session cookies: {str(e)}")
+            return False
+        
+        self.username = saved.get("username")
+        self.password_hash = saved.get("password_hash")
+        if self.check_login_status():
+            self.logger.info(f"Restored saved session for {self.username}")
+            return True
+        self.logger.info("Saved session is no longer valid, a fresh login is required")
+        return False
+    
+    @instrumented('clear_session')
+    def clear_session(self):
+        """Log the browser out by dropping its cookies and the saved session"""
+        try:
+            # delete_all_cookies only covers the current domain
+            self._navigate(f"{self.base_url}/robots.txt")
+            self.driver.delete_all_cookies()
+        except Exception as e:
+            self.logger.warning(f"Could not clear browser cookies: {str(e)}")
+        self.is_logged_in = False
+        self.username = None
+        self.password_hash = None
+        if self.cookie_file:
+            try:
+                os.remove(self.cookie_file)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Could not remove saved session: {str(e)}")
+        self.logger.info("Session cleared")
+    
+    @instrumented('get_user_followers')
     def get_user_followers(self, username, max_count=100):
         """Extract followers of a given username"""
         if not self.is_logged_in:
@@ -106,18 +434,19 @@ class InstagramBot:
         
         try:
             # Navigate to user's profile
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            time.sleep(3)
+            self._navigate(f"{self.base_url}/{username}/")
             
-            # Click on followers link
-            followers_link = self.driver.find_element(By.XPATH, "//a[contains(@href, '/followers')]")
+            # Click on followers link as soon as the profile has rendered it
+            followers_link = self._wait(Config.PAGE_READY_TIMEOUT,
+                EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '/followers')]"))
+            )
             followers_count = followers_link.text.replace("followers", "").strip()
-            followers_link.click()
+            self._click(followers_link)
             
             self.logger.info(f"Extracting up to {max_count} followers from {username} (total: {followers_count})")
             
             # Wait for the followers modal to appear
-            followers_modal = WebDriverWait(self.driver, 10).until(
+            followers_modal = self._wait(Config.PAGE_READY_TIMEOUT,
                 EC.presence_of_element_located((By.XPATH, "//div[@role='dialog']"))
             )
             
@@ -131,6 +460,7 @@ class InstagramBot:
             self.logger.error(f"Error getting followers: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @instrumented('get_user_following')
     def get_user_following(self, username, max_count=100):
         """Extract following of a given username"""
         if not self.is_logged_in:
@@ -139,18 +469,19 @@ class InstagramBot:
         
         try:
             # Navigate to user's profile
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            time.sleep(3)
+            self._navigate(f"{self.base_url}/{username}/")
             
-            # Click on following link
-            following_link = self.driver.find_element(By.XPATH, "//a[contains(@href, '/following')]")
+            # Click on following link as soon as the profile has rendered it
+            following_link = self._wait(Config.PAGE_READY_TIMEOUT,
+                EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '/following')]"))
+            )
             following_count = following_link.text.replace("following", "").strip()
-            following_link.click()
+            self._click(following_link)
             
             self.logger.info(f"Extracting up to {max_count} following from {username} (total: {following_count})")
             
             # Wait for the following modal to appear
-            following_modal = WebDriverWait(self.driver, 10).until(
+            following_modal = self._wait(Config.PAGE_READY_TIMEOUT,
                 EC.presence_of_element_located((By.XPATH, "//div[@role='dialog']"))
             )
             
@@ -173,7 +504,7 @@ class InstagramBot:
         
         while len(user_elements) < max_count and scroll_attempts < max_scroll_attempts:
             # Find all username elements
-            user_elements = modal.find_elements(By.XPATH, ".//a[contains(@href, '/')]")
+            user_elements = self._find_all(By.XPATH, USER_LINK_XPATH, root=modal)
             
             # If no new users were loaded after scrolling, break
             if len(user_elements) == previous_count:
@@ -184,11 +515,18 @@ class InstagramBot:
             previous_count = len(user_elements)
             
             # Scroll down in the modal
-            self.driver.execute_script(
+            self._script(
                 "arguments[0].scrollTop = arguments[0].scrollHeight", 
                 modal
             )
-            time.sleep(2)
+            
+            # Continue as soon as the next page of users arrives, or give up on this attempt
+            try:
+                self._wait_any({
+                    "loaded": waits.element_count_above(By.XPATH, USER_LINK_XPATH, previous_count, root=modal)
+                }, Config.SCROLL_LOAD_TIMEOUT, phase='probe')
+            except TimeoutException:
+                pass
         
         # Extract usernames
         usernames = []
@@ -202,6 +540,7 @@ class InstagramBot:
                 
         return usernames
     
+    @instrumented('send_dm')
     def send_dm(self, username, message):
         """Send a direct message to a specific user"""
         if not self.is_logged_in:
@@ -210,8 +549,8 @@ class InstagramBot:
         
         try:
             # Go to the user's profile
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            time.sleep(3)
+            self._navigate(f"{self.base_url}/{username}/")
+            self._wait(Config.PAGE_READY_TIMEOUT, waits.document_ready)
             
             # Check if the user exists
             if "Page Not Found" in self.driver.title or "Sorry, this page isn't available" in self.driver.page_source:
@@ -220,29 +559,28 @@ class InstagramBot:
             
             # Click on message button
             try:
-                message_button = WebDriverWait(self.driver, 5).until(
+                message_button = self._wait(5,
                     EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'Message') or contains(text(), 'Send Message')]"))
                 )
-                message_button.click()
-                time.sleep(3)
+                self._click(message_button)
             except TimeoutException:
                 self.logger.warning(f"Could not find message button for {username}")
                 return {"status": "error", "message": f"Could not find message button for {username}"}
             
             # Find message input field and send message
             try:
-                message_input = WebDriverWait(self.driver, 10).until(
+                message_input = self._wait(10,
                     EC.presence_of_element_located((By.XPATH, "//div[@role='textbox']"))
                 )
-                message_input.click()
-                time.sleep(1)
-                message_input.send_keys(message)
-                time.sleep(2)
+                self._click(message_input)
+                self._sleep(1)
+                self._type(message_input, message)
+                self._sleep(2)
                 
                 # Click send button
-                send_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Send')]")
-                send_button.click()
-                time.sleep(2)
+                send_button = self._find(By.XPATH, "//button[contains(text(), 'Send')]")
+                self._click(send_button)
+                self._sleep(2)
                 
                 self.logger.info(f"Message sent to {username}")
                 return {"status": "success", "message": f"Message sent to {username}"}
@@ -254,6 +592,7 @@ class InstagramBot:
             self.logger.error(f"Error sending DM to {username}: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @instrumented('mass_dm')
     def mass_dm(self, usernames, message, delay_range=(30, 60), progress_callback=None):
         """Send DMs to multiple users with random delays"""
         if not self.is_logged_in:
@@ -306,7 +645,7 @@ class InstagramBot:
                         "status": "waiting",
                         "delay": delay
                     })
-                time.sleep(delay)
+                self._sleep(delay, phase='pacing')
         
         return {
             "status": "complete",
@@ -321,6 +660,9 @@ class InstagramBot:
     def close(self):
         """Close the webdriver"""
         if self.driver:
+            # Cookies may have been refreshed since login
+            if self.is_logged_in:
+                self.save_session()
             self.driver.quit()
             self.logger.info("Webdriver closed")
             self.driver = None
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+import uuid
+
+
+class Job:
+    """A single browser operation queued on the JobManager"""
+
+    def __init__(self, kind, func, args=(), kwargs=None, meta=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.meta = meta or {}
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ("finished", "failed")
+
+    def to_dict(self):
+        """Serialize the job for the status endpoint and Socket.IO events"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobManager:
+    """Run blocking browser work off the request handlers, one job at a time
+
+    Jobs are consumed by a single background task so the shared webdriver is
+    never driven from two places at once. The blocking call itself is handed
+    to a native thread pool when running under an un-patched eventlet hub (a
+    monkey-patched one already makes it cooperative), so HTTP requests and
+    Socket.IO heartbeats keep being served meanwhile.
+    """
+
+    def __init__(self, socketio, on_complete=None, result_ttl=600):
+        self.logger = logging.getLogger('jobs')
+        self.socketio = socketio
+        self.on_complete = on_complete
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker_started = False
+
+    def submit(self, kind, func, *args, meta=None, **kwargs):
+        """Queue func(*args, **kwargs) and return the Job immediately"""
+        job = Job(kind, func, args, kwargs, meta)
+        self._prune()
+        with self._lock:
+            self._jobs[job.id] = job
+        self._ensure_worker()
+        self._queue.put(job)
+        self.logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id):
+        """Return the job with the given id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def counts(self):
+        """Number of known jobs per status"""
+        counts = {}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker_started:
+                return
+            self._queue = self.socketio.server.eio.create_queue()
+            self._worker_started = True
+        self.socketio.start_background_task(self._worker)
+
+    def _worker(self):
+        """Consume queued jobs forever, running each to completion"""
+        while True:
+            job = self._queue.get()
+            self._run(job)
+
+    def _run(self, job):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = self._offload(job.func, *job.args, **job.kwargs)
+            job.status = "finished"
+        except Exception as e:
+            self.logger.error(f"Error in {job.kind} job {job.id}: {str(e)}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        self.logger.info(f"{job.kind} job {job.id} {job.status} in {job.finished_at - job.started_at:.2f}s")
+
+        if self.on_complete:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                self.logger.error(f"Error in completion callback for job {job.id}: {str(e)}")
+
+    def _offload(self, func, *args, **kwargs):
+        """Call func outside the green-thread hub when the hub would block on it"""
+        if self.socketio.async_mode == 'eventlet':
+            from eventlet import patcher, tpool
+            if patcher.is_monkey_patched('socket'):
+                # Selenium's HTTP client and sleeps already yield to the hub, and
+                # green sockets must not be used from tpool's native threads
+                return func(*args, **kwargs)
+            return tpool.execute(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    def _prune(self):
+        """Forget finished jobs older than result_ttl"""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.done and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,89 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, sized for browser operations
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120)
+
+
+class Metrics:
+    """Thread-safe counters and histograms rendered in Prometheus text format"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+
+    def describe(self, name, kind, help_text):
+        """Register a metric's type ('counter' or 'histogram') and help text"""
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts followed by the running sum and count
+            state = series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Observe the wall time of the with-block, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._help) | set(self._counters) | set(self._histograms)):
+                kind, help_text = self._help.get(
+                    name, ('histogram' if name in self._histograms else 'counter', ''))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+                for key, state in sorted(self._histograms.get(name, {}).items()):
+                    for i, bound in enumerate(self.buckets):
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', str(bound)),))} {state[i]}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in key)
+    return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(key, escaped)) + "}"
+
+
+# Process-wide registry
+metrics = Metrics()
+metrics.describe('instagram_bot_operation_seconds', 'histogram',
+                 'Wall time of InstagramBot operations')
+metrics.describe('instagram_bot_phase_seconds', 'histogram',
+                 'Wall time spent per phase (navigation, wait, probe, sleep, click, script, ...) of an operation')
+metrics.describe('instagram_bot_operations_total', 'counter',
+                 'InstagramBot operations by result status')
+metrics.describe('instagram_bot_timeouts_total', 'counter',
+                 'Webdriver waits that timed out, excluding probes for optional elements')
+metrics.describe('instagram_bot_driver_errors_total', 'counter',
+                 'Webdriver errors other than timeouts')
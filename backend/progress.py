@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+
+
+class ProgressState:
+    """Mass DM progress shared between the worker and the Socket.IO publisher
+
+    The worker records every state change through update(); the publisher
+    calls drain() on a fixed tick and emits at most one coalesced message per
+    run and tick, carrying the latest counters and the events seen since the
+    last one. A run that finishes just before the next one starts keeps its
+    final update until it has been drained.
+    """
+
+    def __init__(self, max_events=200):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._state = self._initial_state(0)
+        self._result = None
+        self._dirty = False
+        self._room = None
+        self._pending = []
+
+    @staticmethod
+    def _initial_state(total):
+        return {
+            "running": False,
+            "current": 0,
+            "total": total,
+            "successful": 0,
+            "failed": 0
+        }
+
+    def start(self, total, room):
+        """Reset for a new run owned by the given Socket.IO room; False if one is already running"""
+        with self._lock:
+            if self._state["running"]:
+                return False
+            if self._dirty:
+                self._pending.append(self._take())
+            self._state = self._initial_state(total)
+            self._state["running"] = True
+            self._events.clear()
+            self._result = None
+            self._dirty = True
+            self._room = room
+            return True
+
+    def update(self, data):
+        """Record a progress_callback event from InstagramBot.mass_dm"""
+        with self._lock:
+            if data["status"] == "success":
+                self._state["successful"] += 1
+            elif data["status"] == "failed":
+                self._state["failed"] += 1
+            self._state["current"] = data["current"]
+            self._events.append({
+                "current": data["current"],
+                "total": data["total"],
+                "username": data.get("username", ""),
+                "status": data["status"],
+                "reason": data.get("reason", ""),
+                "delay": data.get("delay", 0)
+            })
+            self._dirty = True
+
+    def finish(self, result=None, error=None):
+        """Mark the run as over, with its result or an error message"""
+        with self._lock:
+            self._state["running"] = False
+            self._result = {"result": result, "error": error}
+            self._dirty = True
+
+    def snapshot(self):
+        """Return the owning room and a copy of the current counters"""
+        with self._lock:
+            return self._room, dict(self._state)
+
+    def drain(self):
+        """Return the (room, state, events, outcome) updates accumulated since the last call"""
+        with self._lock:
+            updates, self._pending = self._pending, []
+            if self._dirty:
+                updates.append(self._take())
+            return updates
+
+    def _take(self):
+        # Caller holds the lock
+        events = list(self._events)
+        self._events.clear()
+        outcome, self._result = self._result, None
+        self._dirty = False
+        return self._room, dict(self._state), events, outcome
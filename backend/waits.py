@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Conditions take the driver and return a truthy value once satisfied, so they
+# plug into WebDriverWait as well as wait_for_any.
+
+
+@contextmanager
+def no_implicit_wait(driver, restore_to):
+    """Disable the implicit wait so absent elements are reported immediately"""
+    driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        driver.implicitly_wait(restore_to)
+
+
+def wait_for_any(driver, conditions, timeout, poll_frequency=0.1, implicit_wait=None):
+    """Wait until one of several named conditions holds
+
+    conditions is an ordered mapping of name -> condition; they are checked in
+    order on every poll and the first satisfied one wins. Returns a
+    (name, value) tuple, or raises TimeoutException after timeout seconds.
+    If the driver uses an implicit wait, pass it as implicit_wait so element
+    lookups don't stall each poll; it is restored afterwards.
+    """
+    def any_condition(driver):
+        for name, condition in conditions.items():
+            value = condition(driver)
+            if value:
+                return name, value
+        return False
+
+    wait = WebDriverWait(driver, timeout, poll_frequency=poll_frequency)
+    if not implicit_wait:
+        return wait.until(any_condition)
+    with no_implicit_wait(driver, implicit_wait):
+        return wait.until(any_condition)
+
+
+def document_ready(driver):
+    """The DOM has been parsed (readyState is interactive or complete)"""
+    return driver.execute_script("return document.readyState") != "loading"
+
+
+def url_contains(*fragments):
+    """The current URL contains any of the fragments"""
+    def condition(driver):
+        url = driver.current_url
+        return any(fragment in url for fragment in fragments)
+    return condition
+
+
+def url_lacks(fragment):
+    """The current URL no longer contains the fragment"""
+    def condition(driver):
+        return fragment not in driver.current_url
+    return condition
+
+
+def element_present(by, value, root=None):
+    """An element matching the locator exists; returns it"""
+    def condition(driver):
+        elements = (root or driver).find_elements(by, value)
+        return elements[0] if elements else False
+    return condition
+
+
+def element_clickable(by, value, root=None):
+    """A visible, enabled element matching the locator exists; returns it"""
+    def condition(driver):
+        for element in (root or driver).find_elements(by, value):
+            if element.is_displayed() and element.is_enabled():
+                return element
+        return False
+    return condition
+
+
+def element_count_above(by, value, count, root=None):
+    """More than count elements match the locator; returns them"""
+    def condition(driver):
+        elements = (root or driver).find_elements(by, value)
+        return elements if len(elements) > count else False
+    return condition
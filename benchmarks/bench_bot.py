@@ -0,0 +1,143 @@
+"""Benchmark InstagramBot against the local stand-in site
+
+Runs each bot operation once per browser resource profile and reports wall
+time, the part of it spent in fixed sleeps, the remainder (real waiting and
+work), bytes served and the browser's resident memory afterwards. Needs
+Chrome and a chromedriver (set CHROMEDRIVER_PATH to run without network).
+
+    python -m benchmarks.bench_bot [--profiles lean,full] [--json results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.site import StandInSite
+from backend.instagram_bot import InstagramBot
+
+def browser_rss(bot):
+    """Resident memory in bytes of chromedriver and every process below it (Linux only)"""
+    if not os.path.isdir('/proc') or bot.driver is None:
+        return None
+    try:
+        root = bot.driver.service.process.pid
+    except AttributeError:
+        return None
+
+    children = {}
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                # The command name may contain spaces, so split after its closing parenthesis
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(pid))
+
+    total = 0
+    pending = [root]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+def measure(site, bot, operation, func):
+    """Run one operation and return its measurements"""
+    sleep_before = bot.sleep_time if bot else 0.0
+    bytes_before = site.bytes_sent
+    start = time.perf_counter()
+    result = func()
+    wall = time.perf_counter() - start
+
+    if bot is None:
+        bot = result
+        result = {"status": "success"}
+    sleep = bot.sleep_time - sleep_before
+    ok = result is True or (isinstance(result, dict) and result.get("status") == "success")
+    rss = browser_rss(bot)
+    return bot, {
+        "operation": operation,
+        "ok": ok,
+        "wall_s": round(wall, 3),
+        "sleep_s": round(sleep, 3),
+        "wait_s": round(wall - sleep, 3),
+        "bytes": site.bytes_sent - bytes_before,
+        "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None
+    }
+
+def login_without_banner(site, bot):
+    # The login page redirects a logged-in browser, so start from a logged-out one
+    bot.clear_session()
+    site.cookie_banner = False
+    try:
+        return bot.login('benchuser', 'benchpass')
+    finally:
+        site.cookie_banner = True
+
+def run_profile(site, profile, max_count):
+    """Benchmark every bot operation with one resource profile"""
+    rows = []
+    bot, row = measure(site, None, 'launch', lambda: InstagramBot(
+        headless=True, resource_profile=profile, cookie_file='', base_url=site.base_url
+    ))
+    rows.append(row)
+    try:
+        operations = [
+            ('login', lambda: bot.login('benchuser', 'benchpass')),
+            # Same form without the consent banner, so the banner probe has to time out
+            ('login_no_banner', lambda: login_without_banner(site, bot)),
+            ('check_login_status', bot.check_login_status),
+            ('get_user_followers', lambda: bot.get_user_followers('benchtarget', max_count=max_count)),
+            ('get_user_following', lambda: bot.get_user_following('benchtarget', max_count=max_count))
+        ]
+        for operation, func in operations:
+            rows.append(measure(site, bot, operation, func)[1])
+    finally:
+        bot.close()
+    for row in rows:
+        row["profile"] = profile
+    return rows
+
+def print_report(rows):
+    header = f"{'profile':<8} {'operation':<20} {'ok':<4} {'wall_s':>8} {'sleep_s':>8} {'wait_s':>8} {'kbytes':>9} {'rss_mb':>8}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        rss = f"{row['rss_mb']:.1f}" if row['rss_mb'] is not None else 'n/a'
+        print(f"{row['profile']:<8} {row['operation']:<20} {'yes' if row['ok'] else 'NO':<4} "
+              f"{row['wall_s']:>8.2f} {row['sleep_s']:>8.2f} {row['wait_s']:>8.2f} "
+              f"{row['bytes'] / 1024:>9.0f} {rss:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', default='lean,full', help='comma-separated resource profiles to compare')
+    parser.add_argument('--max-count', type=int, default=50, help='users to extract per list')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    rows = []
+    with StandInSite() as site:
+        for profile in args.profiles.split(','):
+            rows.extend(run_profile(site, profile.strip(), args.max_count))
+
+    print_report(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+    # A failed operation is a regression even if it was fast
+    return 0 if all(row["ok"] for row in rows) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Measure cold import time of backend.app and time to the first /healthz response
+
+Each run is a fresh interpreter so nothing is cached in-process. The script
+fails if importing the app pulls in the browser stack (selenium or
+webdriver-manager), or if the median import time exceeds --max-seconds.
+
+    python -m benchmarks.bench_import [--runs 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter and prints its measurements as JSON
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import backend.app
+imported = time.perf_counter()
+response = backend.app.app.test_client().get('/healthz')
+print(json.dumps({
+    "import_s": imported - start,
+    "first_healthz_s": time.perf_counter() - start,
+    "healthz_status": response.status_code,
+    "browser_stack_loaded": any(name in sys.modules for name in ('selenium', 'webdriver_manager'))
+}))
+"""
+
+def probe():
+    env = dict(os.environ, PREWARM_BROWSER='false')
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=2.0, help='fail if the median import is slower')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    result = {
+        "runs": args.runs,
+        "import_median_s": round(statistics.median(run["import_s"] for run in runs), 3),
+        "import_max_s": round(max(run["import_s"] for run in runs), 3),
+        "first_healthz_median_s": round(statistics.median(run["first_healthz_s"] for run in runs), 3),
+        "healthz_ok": all(run["healthz_status"] == 200 for run in runs),
+        "browser_stack_loaded": any(run["browser_stack_loaded"] for run in runs)
+    }
+    for key, value in result.items():
+        print(f"{key:<24} {value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    ok = (result["healthz_ok"] and not result["browser_stack_loaded"]
+          and result["import_median_s"] <= args.max_seconds)
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Load-test the web tier while a browser operation is running
+
+Starts the stand-in site and the production server (gunicorn with the
+eventlet worker, pointed at the stand-in site), measures GET / latency at
+rest, then again while a login job drives the browser. The web tier is
+healthy if latency stays flat; the script fails if p99 under load exceeds
+--max-p99-ms. Needs Chrome and a chromedriver like bench_bot.
+
+    python -m benchmarks.bench_web [--requests 200] [--concurrency 8]
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from benchmarks.site import StandInSite
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up within {timeout}s")
+
+def measure_latency(url, requests, concurrency):
+    """GET url `requests` times from `concurrency` threads; return latencies in ms"""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = max(1, requests // concurrency)
+
+    def worker():
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            urllib.request.urlopen(url, timeout=30).read()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def summarize(label, latencies):
+    row = {
+        "phase": label,
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(latencies[-1], 1)
+    }
+    print(f"{label:<14} n={row['requests']:<5} p50={row['p50_ms']:>8.1f}ms "
+          f"p99={row['p99_ms']:>8.1f}ms max={row['max_ms']:>8.1f}ms")
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='requests per measurement phase')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-p99-ms', type=float, default=500, help='fail if p99 under load exceeds this')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with StandInSite() as site:
+        env = dict(os.environ,
+                   PORT=str(port),
+                   INSTAGRAM_BASE_URL=site.base_url,
+                   SESSION_COOKIE_FILE='',
+                   PREWARM_BROWSER='false')
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+            cwd=ROOT_DIR, env=env
+        )
+        try:
+            wait_until_up(base_url + '/')
+            rows = [summarize('idle', measure_latency(base_url + '/', args.requests, args.concurrency))]
+
+            # Start a browser operation (browser launch + login) and measure while it runs
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+            request = urllib.request.Request(
+                base_url + '/api/login',
+                data=json.dumps({"username": "benchuser", "password": "benchpass"}).encode(),
+                headers={'Content-Type': 'application/json'}
+            )
+            job = json.loads(opener.open(request).read())
+            rows.append(summarize('during_login', measure_latency(base_url + '/', args.requests, args.concurrency)))
+
+            status = json.loads(opener.open(f"{base_url}/api/jobs/{job['job_id']}").read())
+            print(f"login job status after measurement: {status['status']}")
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+    return 0 if rows[-1]["p99_ms"] <= args.max_p99_ms else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
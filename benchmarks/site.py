@@ -0,0 +1,136 @@
+"""Local stand-in for the pages InstagramBot drives, served from fixtures/"""
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Markers around the consent banner in login.html
+BANNER_START = b"<!-- cookie-banner"
+BANNER_END = b"<!-- /cookie-banner -->"
+
+# Heavy resources the lean browser profile should skip, as (content type, size in bytes)
+STATIC_PAYLOADS = {
+    '.jpg': ('image/jpeg', 150 * 1024),
+    '.mp4': ('video/mp4', 2 * 1024 * 1024),
+    '.woff2': ('font/woff2', 80 * 1024)
+}
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Route the handful of URLs the bot visits to the HTML fixtures"""
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        parts = [part for part in path.split('/') if part]
+
+        if path == '/robots.txt':
+            self._send(b"User-agent: *\n", 'text/plain')
+        elif path.startswith('/static/'):
+            self._send_static(path)
+        elif parts[:2] == ['accounts', 'login']:
+            # Like the live site, a logged-in browser is sent home instead of the form
+            if self._logged_in():
+                self._redirect('/')
+            else:
+                self._send_login()
+        elif parts[:1] == ['challenge']:
+            self._send(b"<html><body><h1>Help us confirm it's you</h1></body></html>", 'text/html')
+        elif not parts:
+            # The home page shows the login form unless a session cookie is present
+            if self._logged_in():
+                self._send_fixture('home.html')
+            else:
+                self._send_login()
+        elif len(parts) == 1 or (len(parts) == 2 and parts[1] in ('followers', 'following')):
+            self._send_fixture('profile.html')
+        else:
+            self._send(b"Sorry, this page isn't available.", 'text/html', status=404)
+
+    def _send_static(self, path):
+        name = path[len('/static/'):]
+        if name == 'bench.css':
+            self._send_fixture('bench.css', 'text/css')
+            return
+        for ext, (content_type, size) in STATIC_PAYLOADS.items():
+            if name.endswith(ext):
+                self._send(b"\0" * size, content_type)
+                return
+        self._send(b"", 'text/plain', status=404)
+
+    def _logged_in(self):
+        return 'sessionid=' in self.headers.get('Cookie', '')
+
+    def _redirect(self, location):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_login(self):
+        with open(os.path.join(FIXTURES_DIR, 'login.html'), 'rb') as f:
+            body = f.read()
+        if not self.server.cookie_banner:
+            # Returning visitors who already consented get no banner
+            start = body.index(BANNER_START)
+            end = body.index(BANNER_END) + len(BANNER_END)
+            body = body[:start] + body[end:]
+        self._send(body, 'text/html')
+
+    def _send_fixture(self, name, content_type='text/html'):
+        with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+            self._send(f.read(), content_type)
+
+    def _send(self, body, content_type, status=200):
+        with self.server.bytes_lock:
+            self.server.bytes_sent += len(body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInSite:
+    """Serve the stand-in site on localhost from a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), StandInHandler)
+        self.server.bytes_sent = 0
+        self.server.bytes_lock = threading.Lock()
+        self.server.cookie_banner = True
+        self.thread = None
+
+    @property
+    def cookie_banner(self):
+        """Whether login pages show the cookie consent banner"""
+        return self.server.cookie_banner
+
+    @cookie_banner.setter
+    def cookie_banner(self, enabled):
+        self.server.cookie_banner = enabled
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def bytes_sent(self):
+        return self.server.bytes_sent
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -24,12 +24,21 @@ document.addEventListener('DOMContentLoaded', () => {
     const selectAllBtn = document.getElementById('select-all-btn');
     const useSelectedBtn = document.getElementById('use-selected-btn');
 
+    // How often to poll background jobs (ms)
+    const JOB_POLL_INTERVAL = 1000;
+    
     // Socket.IO Connection for real-time updates
     const socket = io();
     
-    // Extracted users storage
+    // Extracted users storage; the selection is a Set so long lists stay cheap
     let extractedUsers = [];
-    let selectedUsers = [];
+    let selectedUsers = new Set();
+    
+    // Virtualized users list: only rows in or near the viewport are in the DOM
+    const USER_ROW_HEIGHT = 32;  // px, must match .user-item in style.css
+    const USER_ROW_OVERSCAN = 10;
+    const usersListContainer = usersList.parentElement;
+    let usersRenderScheduled = false;
     
     // Event Listeners
     loginForm.addEventListener('submit', handleLogin);
@@ -37,17 +46,32 @@ document.addEventListener('DOMContentLoaded', () => {
     logoutBtn.addEventListener('click', handleLogout);
     extractForm.addEventListener('submit', handleExtractUsers);
     dmForm.addEventListener('submit', handleSendDM);
+    usersListContainer.addEventListener('scroll', scheduleUsersRender);
+    usersList.addEventListener('change', handleUserToggle);
+    selectAllBtn.addEventListener('click', handleSelectAll);
+    useSelectedBtn.addEventListener('click', hideUsersModal);
+    closeModal.addEventListener('click', hideUsersModal);
     
     // Socket event handlers for real-time progress updates
+    // Updates are coalesced server-side: counters plus the events since the last update
     socket.on('dm_progress_update', (data) => {
+        if (data.snapshot && data.running) {
+            showProgressSection();
+        }
         updateProgress(data);
-        addLogEntry(formatLogMessage(data), getLogClass(data.status));
+        data.events.forEach(event => {
+            addLogEntry(formatLogMessage(event), getLogClass(event.status));
+        });
     });
     
     socket.on('dm_complete', (data) => {
         addLogEntry(`Mass DM process completed. ${data.summary.successful} successful, ${data.summary.failed} failed.`, 'success');
     });
     
+    socket.on('dm_error', (data) => {
+        addLogEntry(`Mass DM process failed: ${data.message}`, 'error');
+    });
+    
     // Core functionality
     function handleLogin(event) {
         event.preventDefault();
@@ -63,6 +87,7 @@ document.addEventListener('DOMContentLoaded', () => {
             body: JSON.stringify({ username, password })
         })
         .then(response => response.json())
+        .then(waitForJob)
         .then(data => {
             if (data.status === 'success') {
                 showMessage(loginMessage, 'Login successful!', 'success');
@@ -80,6 +105,41 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
     
+    function handleVerificationComplete() {
+        showMessage(loginMessage, 'Checking verification...', 'info');
+        
+        fetch('/api/verify-complete', { method: 'POST' })
+        .then(response => response.json())
+        .then(waitForJob)
+        .then(data => {
+            if (data.status === 'success') {
+                showMessage(loginMessage, 'Login successful!', 'success');
+                verificationSection.classList.add('hidden');
+                loggedUsername.textContent = document.getElementById('username').value;
+                showBotSection();
+            } else {
+                showMessage(loginMessage, `Verification failed: ${data.message}`, 'error');
+            }
+        })
+        .catch(error => {
+            showMessage(loginMessage, `Error: ${error.message}`, 'error');
+        });
+    }
+    
+    function handleLogout() {
+        fetch('/api/logout', { method: 'POST' })
+        .then(response => response.json())
+        .then(() => {
+            extractedUsers = [];
+            selectedUsers.clear();
+            hideProgressSection();
+            showLoginSection('You have been logged out.', 'info');
+        })
+        .catch(error => {
+            showMessage(dmMessage, `Error: ${error.message}`, 'error');
+        });
+    }
+    
     function handleExtractUsers(event) {
         event.preventDefault();
         
@@ -99,13 +159,16 @@ document.addEventListener('DOMContentLoaded', () => {
             })
         })
         .then(response => response.json())
+        .then(waitForJob)
         .then(data => {
             if (data.status === 'success') {
-                const users = data[extractType] || [];
-                extractedUsers = users;
+                // A row can hold several links to the same profile; keep each username once
+                const users = [...new Set(data[extractType] || [])];
                 
                 showMessage(extractMessage, `Successfully extracted ${users.length} ${extractType}.`, 'success');
                 showUsersModal(users);
+            } else if (data.logged_out) {
+                showLoginSection('Your browser session has expired. Please log in again.');
             } else {
                 showMessage(extractMessage, `Extraction failed: ${data.message}`, 'error');
             }
@@ -124,13 +187,13 @@ document.addEventListener('DOMContentLoaded', () => {
         const maxDelay = parseFloat(document.getElementById('max-delay').value);
         
         // Validation checks
-        if (selectedUsers.length === 0) {
+        if (selectedUsers.size === 0) {
             showMessage(dmMessage, 'No users selected. Please extract and select users first.', 'error');
             return;
         }
         
-        // Limit users based on maxDMs
-        const usernamesToMessage = selectedUsers.slice(0, maxDMs);
+        // Limit users based on maxDMs, keeping the extraction order
+        const usernamesToMessage = extractedUsers.filter(user => selectedUsers.has(user)).slice(0, maxDMs);
         
         showMessage(dmMessage, `Starting to send messages to ${usernamesToMessage.length} users...`, 'info');
         resetProgress();
@@ -150,6 +213,9 @@ document.addEventListener('DOMContentLoaded', () => {
         .then(data => {
             if (data.status === 'started') {
                 addLogEntry(`Starting to send messages to ${data.total} users...`, 'info');
+            } else if (data.logged_out) {
+                hideProgressSection();
+                showLoginSection('Your browser session has expired. Please log in again.');
             } else {
                 showMessage(dmMessage, `Failed to start: ${data.message}`, 'error');
                 hideProgressSection();
@@ -161,38 +227,122 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
     
+    // Browser operations run as background jobs; poll until the result is ready
+    function waitForJob(data) {
+        if (data.status !== 'pending') {
+            return data;
+        }
+        
+        return new Promise((resolve, reject) => {
+            const poll = () => {
+                fetch(`/api/jobs/${data.job_id}`)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'finished') {
+                        resolve(job.result);
+                    } else if (job.status === 'queued' || job.status === 'running') {
+                        setTimeout(poll, JOB_POLL_INTERVAL);
+                    } else {
+                        resolve({ status: 'error', message: job.error || job.message });
+                    }
+                })
+                .catch(reject);
+            };
+            poll();
+        });
+    }
+    
     // Helper functions for UI updates and state management
     function showUsersModal(users) {
         // UI implementation for user selection modal
-        usersList.innerHTML = '';
-        selectedUsers = [];
-        
-        users.forEach(username => {
-            const userItem = document.createElement('div');
-            userItem.className = 'user-item';
-            
-            const checkbox = document.createElement('input');
-            checkbox.type = 'checkbox';
-            checkbox.value = username;
-            checkbox.id = `user-${username}`;
-            checkbox.addEventListener('change', (e) => {
-                if (e.target.checked) {
-                    selectedUsers.push(username);
-                } else {
-                    selectedUsers = selectedUsers.filter(user => user !== username);
-                }
-            });
-            
-            const label = document.createElement('label');
-            label.textContent = username;
-            label.setAttribute('for', `user-${username}`);
-            
-            userItem.appendChild(checkbox);
-            userItem.appendChild(label);
-            usersList.appendChild(userItem);
-        });
+        // The selection is keyed by username, so the list must not repeat any
+        extractedUsers = [...new Set(users)];
+        selectedUsers = new Set();
+        updateSelectAllLabel();
         
+        // Show the modal first so the viewport height is known when rendering
         usersModal.style.display = 'block';
+        usersList.style.height = `${extractedUsers.length * USER_ROW_HEIGHT}px`;
+        usersListContainer.scrollTop = 0;
+        renderVisibleUsers();
+    }
+    
+    function hideUsersModal() {
+        usersModal.style.display = 'none';
+        if (selectedUsers.size > 0) {
+            showMessage(dmMessage, `${selectedUsers.size} users selected.`, 'info');
+        }
+    }
+    
+    function scheduleUsersRender() {
+        if (usersRenderScheduled) {
+            return;
+        }
+        usersRenderScheduled = true;
+        requestAnimationFrame(() => {
+            usersRenderScheduled = false;
+            renderVisibleUsers();
+        });
+    }
+    
+    function renderVisibleUsers() {
+        const first = Math.max(0, Math.floor(usersListContainer.scrollTop / USER_ROW_HEIGHT) - USER_ROW_OVERSCAN);
+        const visibleRows = Math.ceil(usersListContainer.clientHeight / USER_ROW_HEIGHT) + 2 * USER_ROW_OVERSCAN;
+        const last = Math.min(extractedUsers.length, first + visibleRows);
+        
+        const fragment = document.createDocumentFragment();
+        for (let index = first; index < last; index++) {
+            fragment.appendChild(createUserRow(index));
+        }
+        usersList.replaceChildren(fragment);
+    }
+    
+    function createUserRow(index) {
+        const username = extractedUsers[index];
+        const userItem = document.createElement('div');
+        userItem.className = 'user-item';
+        userItem.style.top = `${index * USER_ROW_HEIGHT}px`;
+        
+        const checkbox = document.createElement('input');
+        checkbox.type = 'checkbox';
+        checkbox.value = username;
+        checkbox.id = `user-${index}`;
+        checkbox.dataset.index = index;
+        checkbox.checked = selectedUsers.has(username);
+        
+        const label = document.createElement('label');
+        label.textContent = username;
+        label.setAttribute('for', `user-${index}`);
+        
+        userItem.appendChild(checkbox);
+        userItem.appendChild(label);
+        return userItem;
+    }
+    
+    function handleUserToggle(event) {
+        const username = extractedUsers[event.target.dataset.index];
+        if (event.target.checked) {
+            selectedUsers.add(username);
+        } else {
+            selectedUsers.delete(username);
+        }
+        updateSelectAllLabel();
+    }
+    
+    function handleSelectAll() {
+        // Only the Set changes; the few rendered rows are refreshed afterwards
+        if (selectedUsers.size === extractedUsers.length) {
+            selectedUsers = new Set();
+        } else {
+            selectedUsers = new Set(extractedUsers);
+        }
+        updateSelectAllLabel();
+        renderVisibleUsers();
+    }
+    
+    function updateSelectAllLabel() {
+        const allSelected = extractedUsers.length > 0 && selectedUsers.size === extractedUsers.length;
+        selectAllBtn.textContent = allSelected ? 'Deselect All' : 'Select All';
     }
     
     function updateProgress(data) {
@@ -209,6 +359,31 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
     
+    function formatLogMessage(event) {
+        switch (event.status) {
+            case 'sending':
+                return `Sending message to ${event.username}...`;
+            case 'success':
+                return `Message sent to ${event.username}`;
+            case 'failed':
+                return `Failed to message ${event.username}: ${event.reason}`;
+            case 'waiting':
+                return `Waiting ${event.delay.toFixed(1)} seconds before the next message`;
+            default:
+                return `${event.status} ${event.username || ''}`;
+        }
+    }
+    
+    function getLogClass(status) {
+        if (status === 'success') {
+            return 'success';
+        }
+        if (status === 'failed') {
+            return 'error';
+        }
+        return 'info';
+    }
+    
     function addLogEntry(message, type = 'info') {
         const logEntry = document.createElement('div');
         logEntry.className = `log-entry ${type}`;
@@ -231,10 +406,20 @@ document.addEventListener('DOMContentLoaded', () => {
         botSection.classList.remove('hidden');
     }
     
+    function showLoginSection(message, type = 'warning') {
+        botSection.classList.add('hidden');
+        loginSection.classList.remove('hidden');
+        showMessage(loginMessage, message, type);
+    }
+    
     function showProgressSection() {
         progressSection.style.display = 'block';
     }
     
+    function hideProgressSection() {
+        progressSection.style.display = 'none';
+    }
+    
     function resetProgress() {
         progressBar.style.width = '0%';
         progressText.textContent = '0/0';
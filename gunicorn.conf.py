@@ -0,0 +1,21 @@
+import os
+
+# Flask-SocketIO keeps client sessions in-process and there is a single shared
+# browser, so run exactly one eventlet worker; it serves many connections.
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = 1
+worker_class = 'eventlet'
+worker_connections = 1000
+
+# Mass DM jobs run for a long time inside the worker; only the heartbeat matters here
+timeout = 120
+graceful_timeout = 30
+
+def post_worker_init(worker):
+    # Background tasks belong to the worker process, so start them after the fork
+    from wsgi import start_background_services
+    start_background_services()
+
+def worker_exit(server, worker):
+    from wsgi import shutdown
+    shutdown()
@@ -1,6 +1,21 @@
-from backend.app import app, socketio
+import time
+start_time = time.time()
+
+# wsgi applies eventlet's monkey-patching before the app (and Selenium) load
+from wsgi import app, socketio, start_background_services, shutdown
+from backend.app import logger
+import atexit
 import os
+import signal
+import sys
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
+    start_background_services()
+    
+    # Close the browser on Ctrl+C and on SIGTERM from process managers
+    atexit.register(shutdown)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    logger.info(f"App started in {time.time() - start_time:.2f}s")
     socketio.run(app, host='0.0.0.0', port=port)
@@ -0,0 +1,71 @@
+import logging
+
+from backend import app as app_module
+from backend.bot_manager import BotManager
+from backend.instagram_bot import InstagramBot
+
+
+class StubBot(InstagramBot):
+    """InstagramBot without a browser; login() always succeeds"""
+
+    def __init__(self, username=None, password=None):
+        self.driver = None
+        self.is_logged_in = username is not None
+        self.username = username
+        self.password_hash = self._hash_password(password) if password else None
+        self.calls = []
+        self._operation = None
+        self.logger = logging.getLogger('instagram_bot')
+
+    def clear_session(self):
+        self.calls.append('clear_session')
+        self.is_logged_in = False
+        self.username = None
+        self.password_hash = None
+
+    def login(self, username, password):
+        self.calls.append('login')
+        self.is_logged_in = True
+        self.username = username
+        self.password_hash = self._hash_password(password)
+        return {"status": "success"}
+
+
+def use_bot(monkeypatch, bot):
+    monkeypatch.setattr(app_module, 'bot_manager', BotManager(lambda: bot))
+    return bot
+
+
+def test_run_login_reuses_a_session_with_matching_credentials(monkeypatch):
+    bot = use_bot(monkeypatch, StubBot('alice', 'secret'))
+    assert app_module.run_login('alice', 'secret')["status"] == "success"
+    assert bot.calls == []
+
+
+def test_run_login_clears_a_session_for_other_credentials(monkeypatch):
+    bot = use_bot(monkeypatch, StubBot('alice', 'secret'))
+    assert app_module.run_login('alice', 'wrong')["status"] == "success"
+    assert bot.calls == ['clear_session', 'login']
+
+    bot.calls.clear()
+    app_module.run_login('bob', 'secret')
+    assert bot.calls == ['clear_session', 'login']
+    assert bot.username == 'bob'
+
+
+def test_run_login_uses_the_form_when_logged_out(monkeypatch):
+    bot = use_bot(monkeypatch, StubBot())
+    app_module.run_login('alice', 'secret')
+    assert bot.calls == ['login']
+
+
+def test_run_mass_dm_reports_a_logged_out_browser_as_an_error(monkeypatch):
+    use_bot(monkeypatch, StubBot())
+    progress = app_module.ProgressState()
+    monkeypatch.setattr(app_module, 'dm_progress', progress)
+    progress.start(1, "room-a")
+
+    app_module.run_mass_dm(['bob'], 'hi', (0, 0))
+
+    [(_, _, _, outcome)] = progress.drain()
+    assert outcome == {"result": None, "error": "Not logged in"}
@@ -0,0 +1,86 @@
+import time
+
+from backend.bot_manager import BotManager
+
+
+class Driver:
+    def __init__(self):
+        self.alive = True
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return "about:blank"
+
+
+class StubBot:
+    def __init__(self, logged_in=False):
+        self.driver = Driver()
+        self.is_logged_in = logged_in
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.driver = None
+
+
+def make_manager(idle_timeout=900, logged_in=False):
+    launched = []
+
+    def factory():
+        launched.append(StubBot(logged_in))
+        return launched[-1]
+
+    return BotManager(factory, idle_timeout=idle_timeout), launched
+
+
+def test_launches_lazily_and_reuses_a_healthy_bot():
+    manager, launched = make_manager()
+    assert manager.peek() is None
+    assert manager.state() == {"state": "stopped"}
+
+    with manager.use() as bot:
+        assert manager.state()["in_use"] == 1
+    assert manager.get() is bot
+    assert len(launched) == 1
+
+
+def test_relaunches_a_dead_browser_and_bumps_the_generation():
+    manager, launched = make_manager()
+    first = manager.get()
+    generation = manager.generation
+    first.driver.alive = False
+
+    second = manager.get()
+    assert second is not first
+    assert first.closed
+    assert manager.generation == generation + 1
+
+
+def test_a_restored_login_keeps_the_generation():
+    manager, _ = make_manager(logged_in=True)
+    manager.get()
+    assert manager.generation == 0
+
+
+def test_reap_idle_closes_only_an_idle_unused_browser():
+    manager, _ = make_manager(idle_timeout=0.01)
+    assert not manager.reap_idle()
+
+    with manager.use() as bot:
+        time.sleep(0.02)
+        assert not manager.reap_idle()
+
+    time.sleep(0.02)
+    assert manager.reap_idle()
+    assert bot.closed
+    assert manager.peek() is None
+
+
+def test_close_shuts_the_browser_down():
+    manager, _ = make_manager()
+    bot = manager.get()
+    manager.close()
+    assert bot.closed
+    assert manager.peek() is None
@@ -0,0 +1,139 @@
+import json
+import logging
+import time
+
+import pytest
+import webdriver_manager.chrome
+from selenium.common.exceptions import SessionNotCreatedException
+
+from backend import instagram_bot
+from backend.config import Config
+from backend.instagram_bot import InstagramBot, resolve_chromedriver_path
+
+
+class FakeManager:
+    installs = []
+    path = None
+    error = None
+
+    def install(self):
+        FakeManager.installs.append(FakeManager.path)
+        if FakeManager.error:
+            raise FakeManager.error
+        return FakeManager.path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Point the driver cache at tmp_path and stub out webdriver-manager"""
+    monkeypatch.setattr(instagram_bot, '_driver_path', None)
+    monkeypatch.setattr(Config, 'CHROMEDRIVER_PATH', None)
+    monkeypatch.setattr(Config, 'DRIVER_CACHE_FILE', str(tmp_path / 'cache' / 'driver.json'))
+    monkeypatch.setattr(Config, 'DRIVER_CACHE_TTL', 3600)
+    monkeypatch.setattr(Config, 'DRIVER_OFFLINE', False)
+    monkeypatch.setattr(webdriver_manager.chrome, 'ChromeDriverManager', FakeManager)
+    monkeypatch.setattr(FakeManager, 'installs', [])
+    monkeypatch.setattr(FakeManager, 'error', None)
+
+    fresh = tmp_path / 'fresh-chromedriver'
+    fresh.write_text('')
+    monkeypatch.setattr(FakeManager, 'path', str(fresh))
+    return tmp_path
+
+
+def write_cache(tmp_path, age):
+    cached = tmp_path / 'cached-chromedriver'
+    cached.write_text('')
+    (tmp_path / 'cache').mkdir(exist_ok=True)
+    with open(Config.DRIVER_CACHE_FILE, 'w') as f:
+        json.dump({"path": str(cached), "resolved_at": time.time() - age}, f)
+    return str(cached)
+
+
+def test_resolves_and_persists_without_a_cache(cache):
+    assert resolve_chromedriver_path() == FakeManager.path
+    with open(Config.DRIVER_CACHE_FILE) as f:
+        assert json.load(f)["path"] == FakeManager.path
+
+
+def test_uses_a_cached_path_within_the_ttl(cache):
+    cached = write_cache(cache, age=60)
+    assert resolve_chromedriver_path() == cached
+    assert FakeManager.installs == []
+
+
+def test_resolves_again_once_the_ttl_has_passed(cache):
+    write_cache(cache, age=7200)
+    assert resolve_chromedriver_path() == FakeManager.path
+    assert len(FakeManager.installs) == 1
+
+
+def test_offline_uses_an_expired_cache(cache, monkeypatch):
+    monkeypatch.setattr(Config, 'DRIVER_OFFLINE', True)
+    cached = write_cache(cache, age=7200)
+    assert resolve_chromedriver_path() == cached
+    assert FakeManager.installs == []
+
+
+def test_offline_without_a_cache_fails(cache, monkeypatch):
+    monkeypatch.setattr(Config, 'DRIVER_OFFLINE', True)
+    with pytest.raises(RuntimeError):
+        resolve_chromedriver_path()
+
+
+def test_falls_back_to_a_stale_path_when_the_lookup_fails(cache, monkeypatch):
+    monkeypatch.setattr(FakeManager, 'error', OSError("no network"))
+    cached = write_cache(cache, age=7200)
+    assert resolve_chromedriver_path() == cached
+
+
+def test_refresh_drops_both_caches(cache):
+    write_cache(cache, age=60)
+    resolve_chromedriver_path()
+    assert resolve_chromedriver_path(refresh=True) == FakeManager.path
+    assert len(FakeManager.installs) == 1
+
+
+def make_bot():
+    bot = InstagramBot.__new__(InstagramBot)
+    bot.logger = logging.getLogger('instagram_bot')
+    bot.headless = True
+    bot.resource_profile = 'full'
+    bot._operation = None
+    return bot
+
+
+class FakeDriver:
+    def implicitly_wait(self, seconds):
+        pass
+
+
+def test_setup_driver_re_resolves_when_the_cached_driver_is_stale(cache, monkeypatch):
+    write_cache(cache, age=60)
+    launched = []
+
+    def chrome(service, options):
+        launched.append(service.path)
+        if len(launched) == 1:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 90")
+        return FakeDriver()
+
+    monkeypatch.setattr(instagram_bot.webdriver, 'Chrome', chrome)
+    bot = make_bot()
+    bot.setup_driver()
+
+    assert isinstance(bot.driver, FakeDriver)
+    assert launched[1] == FakeManager.path != launched[0]
+
+
+def test_setup_driver_does_not_retry_offline(cache, monkeypatch):
+    monkeypatch.setattr(Config, 'DRIVER_OFFLINE', True)
+    write_cache(cache, age=60)
+
+    def chrome(service, options):
+        raise SessionNotCreatedException("stale")
+
+    monkeypatch.setattr(instagram_bot.webdriver, 'Chrome', chrome)
+    with pytest.raises(SessionNotCreatedException):
+        make_bot().setup_driver()
+    assert FakeManager.installs == []
@@ -0,0 +1,72 @@
+import threading
+
+from flask import Flask
+from flask_socketio import SocketIO
+
+from backend.jobs import JobManager
+
+
+def make_manager(on_complete=None, result_ttl=600):
+    socketio = SocketIO(Flask(__name__), async_mode='threading')
+    return JobManager(socketio, on_complete=on_complete, result_ttl=result_ttl)
+
+
+def wait_for(manager, job_id, timeout=5):
+    done = threading.Event()
+    manager.on_complete = lambda job: job.id == job_id and done.set()
+    if not manager.get(job_id).done:
+        done.wait(timeout)
+    return manager.get(job_id)
+
+
+def test_submit_runs_the_job_and_keeps_its_result():
+    manager = make_manager()
+    job = manager.submit('add', lambda a, b=0: a + b, 2, b=3, meta={"room": "r"})
+    job = wait_for(manager, job.id)
+
+    assert job.status == "finished"
+    assert job.result == 5
+    assert job.meta == {"room": "r"}
+    assert job.to_dict()["started_at"] <= job.to_dict()["finished_at"]
+
+
+def test_a_failing_job_records_the_error():
+    def fail():
+        raise ValueError("no browser")
+
+    manager = make_manager()
+    job = wait_for(manager, manager.submit('fail', fail).id)
+
+    assert job.status == "failed"
+    assert job.error == "no browser"
+    assert manager.counts() == {"failed": 1}
+
+
+def test_jobs_run_one_at_a_time_in_submission_order():
+    manager = make_manager()
+    running = []
+    order = []
+    lock = threading.Lock()
+
+    def record(n):
+        with lock:
+            running.append(n)
+            assert len(running) == 1
+        order.append(n)
+        with lock:
+            running.remove(n)
+
+    jobs = [manager.submit('record', record, n) for n in range(5)]
+    wait_for(manager, jobs[-1].id)
+
+    assert order == [0, 1, 2, 3, 4]
+    assert all(manager.get(job.id).status == "finished" for job in jobs)
+
+
+def test_finished_jobs_are_pruned_after_the_ttl():
+    manager = make_manager(result_ttl=0)
+    first = wait_for(manager, manager.submit('noop', lambda: None).id)
+    first.finished_at -= 1
+    manager.submit('noop', lambda: None)
+
+    assert manager.get(first.id) is None
@@ -0,0 +1,50 @@
+import pytest
+
+from backend.metrics import Metrics
+
+
+def test_counters_render_with_help_type_and_labels():
+    metrics = Metrics()
+    metrics.describe('requests_total', 'counter', 'Requests served')
+    metrics.inc('requests_total', status='ok')
+    metrics.inc('requests_total', 2, status='ok')
+    metrics.inc('requests_total', status='error')
+
+    lines = metrics.render_prometheus().splitlines()
+    assert lines == [
+        '# HELP requests_total Requests served',
+        '# TYPE requests_total counter',
+        'requests_total{status="error"} 1',
+        'requests_total{status="ok"} 3',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics(buckets=(1, 5))
+    metrics.describe('op_seconds', 'histogram', 'Operation time')
+    metrics.observe('op_seconds', 0.5, op='login')
+    metrics.observe('op_seconds', 3, op='login')
+    metrics.observe('op_seconds', 10, op='login')
+
+    text = metrics.render_prometheus()
+    assert 'op_seconds_bucket{op="login",le="1"} 1\n' in text
+    assert 'op_seconds_bucket{op="login",le="5"} 2\n' in text
+    assert 'op_seconds_bucket{op="login",le="+Inf"} 3\n' in text
+    assert 'op_seconds_sum{op="login"} 13.5\n' in text
+    assert 'op_seconds_count{op="login"} 3\n' in text
+
+
+def test_span_observes_even_when_the_block_raises():
+    metrics = Metrics(buckets=(60,))
+    with pytest.raises(RuntimeError):
+        with metrics.span('op_seconds', op='login'):
+            raise RuntimeError('boom')
+
+    assert 'op_seconds_count{op="login"} 1\n' in metrics.render_prometheus()
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.inc('errors_total', reason='say "hi"\nback\\slash')
+
+    assert 'errors_total{reason="say \\"hi\\"\\nback\\\\slash"} 1\n' in metrics.render_prometheus()
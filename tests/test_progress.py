@@ -0,0 +1,54 @@
+from backend.progress import ProgressState
+
+
+def event(current, status="success", username="user"):
+    return {"current": current, "total": 2, "username": username, "status": status}
+
+
+def test_drain_coalesces_events_for_the_owning_room():
+    progress = ProgressState()
+    assert progress.start(2, "room-a")
+    progress.update(event(1))
+    progress.update(event(2, status="failed"))
+
+    [(room, state, events, outcome)] = progress.drain()
+    assert room == "room-a"
+    assert state == {"running": True, "current": 2, "total": 2, "successful": 1, "failed": 1}
+    assert [e["status"] for e in events] == ["success", "failed"]
+    assert outcome is None
+    assert progress.drain() == []
+
+
+def test_start_refuses_a_second_run():
+    progress = ProgressState()
+    assert progress.start(1, "room-a")
+    assert not progress.start(1, "room-b")
+    assert progress.snapshot()[0] == "room-a"
+
+
+def test_start_keeps_the_previous_outcome_until_drained():
+    progress = ProgressState()
+    progress.start(1, "room-a")
+    progress.update(event(1))
+    progress.finish(result={"successful": 1})
+    assert progress.start(3, "room-b")
+
+    first, second = progress.drain()
+    assert first[0] == "room-a"
+    assert first[1]["running"] is False
+    assert len(first[2]) == 1
+    assert first[3] == {"result": {"successful": 1}, "error": None}
+    assert second[0] == "room-b"
+    assert second[1]["total"] == 3
+    assert second[2] == [] and second[3] is None
+
+
+def test_finish_with_error():
+    progress = ProgressState()
+    progress.start(1, "room-a")
+    progress.drain()
+    progress.finish(error="boom")
+
+    [(_, state, _, outcome)] = progress.drain()
+    assert state["running"] is False
+    assert outcome == {"result": None, "error": "boom"}
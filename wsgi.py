@@ -0,0 +1,18 @@
+"""Production entry point
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+eventlet must monkey-patch the standard library before anything imports
+socket, ssl or threading, otherwise Selenium's urllib3 client keeps the
+blocking versions and every webdriver call stalls the whole hub. So this
+module patches first and only then imports the app.
+"""
+# Config only needs os and dotenv, and loads .env, so it sees the same ASYNC_MODE
+# that SocketIO will be created with
+from backend.config import Config
+
+if (Config.ASYNC_MODE or 'eventlet') == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+from backend.app import app, socketio, start_background_services, shutdown  # noqa: E402